@@ -1,15 +1,161 @@
+"""Display backends for desktop and Google Colab."""
+
+import threading
+import time
+from typing import Optional
+
 import cv2
+import numpy as np
 
 try:
-    colab = __import__('google.colab.patches')
+    __import__('google.colab')
+    from IPython import display as ipython_display
     is_colab = True
 except ModuleNotFoundError:
     is_colab = False
 
+DEFAULT_MAX_FPS = 15.0
+DEFAULT_JPEG_QUALITY = 80
+
+def _check_display_options(max_fps: float, jpeg_quality: int) -> None:
+    if max_fps <= 0:
+        raise ValueError('max_fps must be positive')
+    if not 0 <= jpeg_quality <= 100:
+        raise ValueError('jpeg_quality must be between 0 and 100')
+
+class ColabDisplay:
+    '''
+    A notebook display that updates a single output area in place.
+
+    Frames are throttled to `max_fps`, then JPEG-encoded and published
+    on a background thread. Only the newest pending frame is kept:
+    if encoding falls behind, older frames are dropped
+    instead of blocking the caller.
+    '''
+
+    def __init__(
+        self,
+        max_fps: float = DEFAULT_MAX_FPS,
+        jpeg_quality: int = DEFAULT_JPEG_QUALITY
+    ) -> None:
+        _check_display_options(max_fps, jpeg_quality)
+        self._min_interval_s = 1 / max_fps
+        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self._last_submit_s = float('-inf')
+        self._pending: Optional[np.ndarray] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._handle = None
+        self._shown_frames = 0
+        self._dropped_frames = 0
+        self._worker = threading.Thread(
+            target=self.__encode_loop,
+            name='ColabDisplay',
+            daemon=True
+        )
+        self._worker.start()
+
+    def imshow(
+        self,
+        mat: cv2.typing.MatLike | cv2.cuda.GpuMat | cv2.UMat
+    ) -> None:
+        '''Queues a BGR frame for display, dropping it if throttled.'''
+        now_s = time.monotonic()
+        if now_s - self._last_submit_s < self._min_interval_s:
+            with self._condition:
+                self._dropped_frames += 1
+            return
+        self._last_submit_s = now_s
+        if isinstance(mat, cv2.cuda.GpuMat):
+            frame = mat.download()
+        elif isinstance(mat, cv2.UMat):
+            frame = mat.get()
+        else:
+            # The caller may reuse its buffer before we encode it
+            frame = np.copy(mat)
+        with self._condition:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self._dropped_frames += 1
+            self._pending = frame
+            self._condition.notify()
+
+    def close(self) -> None:
+        '''Stops the encoding thread, discarding any pending frame.'''
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            self._condition.notify()
+        self._worker.join()
+
+    def stats(self) -> str:
+        '''Summarizes how many frames were shown and dropped.'''
+        with self._condition:
+            shown_frames = self._shown_frames
+            dropped_frames = self._dropped_frames
+        return (
+            f'Colab display: shown {shown_frames} frames,'
+            f' dropped {dropped_frames}'
+        )
+
+    def __encode_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                frame = self._pending
+                self._pending = None
+            success, buffer = cv2.imencode('.jpg', frame, self._encode_params)
+            if success:
+                self.__publish(buffer.tobytes())
+            with self._condition:
+                if success:
+                    self._shown_frames += 1
+                else:
+                    self._dropped_frames += 1
+
+    def __publish(self, jpeg: bytes) -> None:
+        image = ipython_display.Image(data=jpeg, format='jpeg')
+        if self._handle is None:
+            self._handle = ipython_display.display(image, display_id=True)
+        else:
+            self._handle.update(image)
+
+_colab_displays: dict[str, ColabDisplay] = {}
+_colab_display_options = {
+    'max_fps': DEFAULT_MAX_FPS,
+    'jpeg_quality': DEFAULT_JPEG_QUALITY
+}
+
+def configure_colab_display(
+    max_fps: float = DEFAULT_MAX_FPS,
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY
+) -> None:
+    '''Sets the options used by Colab windows created from now on.'''
+    _check_display_options(max_fps, jpeg_quality)
+    _colab_display_options['max_fps'] = max_fps
+    _colab_display_options['jpeg_quality'] = jpeg_quality
+
 def _cv2_imshow_colab(
     winname: str,
     mat: cv2.typing.MatLike | cv2.cuda.GpuMat | cv2.UMat
 ) -> None:
-    colab.cv2_imshow(mat)
+    display = _colab_displays.get(winname)
+    if display is None:
+        display = _colab_displays[winname] = ColabDisplay(
+            **_colab_display_options
+        )
+    display.imshow(mat)
+
+def _cv2_destroy_all_windows_colab() -> None:
+    while _colab_displays:
+        _, display = _colab_displays.popitem()
+        display.close()
+        print(display.stats())
 
 cv2_imshow = _cv2_imshow_colab if is_colab else cv2.imshow
+cv2_destroy_all_windows = _cv2_destroy_all_windows_colab if is_colab \
+    else cv2.destroyAllWindows
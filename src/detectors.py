@@ -1,7 +1,8 @@
 """MediaPipe landmarkers."""
 
 import abc
-from typing import Generic, Optional, TypeVar
+from typing import (Any, Callable, Generic, Iterable, Mapping, Optional,
+                    TypeVar)
 
 import mediapipe as mp
 from mediapipe.tasks import python
@@ -26,6 +27,11 @@ class Detector(Generic[T]):
     def result(self) -> T:
         pass
 
+    @abc.abstractmethod
+    def close(self) -> None:
+        '''Frees the landmarker's native resources.'''
+        pass
+
 class HandDetector(Detector[Optional[HandLandmarkerResult]]):
     def __init__(
         self,
@@ -62,6 +68,9 @@ class HandDetector(Detector[Optional[HandLandmarkerResult]]):
     def result(self) -> Optional[HandLandmarkerResult]:
         return self._result
 
+    def close(self) -> None:
+        self._detector.close()
+
 class FaceDetector(Detector[Optional[FaceLandmarkerResult]]):
     def __init__(
         self,
@@ -98,6 +107,9 @@ class FaceDetector(Detector[Optional[FaceLandmarkerResult]]):
     def result(self) -> Optional[FaceLandmarkerResult]:
         return self._result
 
+    def close(self) -> None:
+        self._detector.close()
+
 class BodyDetector(Detector[Optional[PoseLandmarkerResult]]):
     def __init__(
         self,
@@ -133,3 +145,89 @@ class BodyDetector(Detector[Optional[PoseLandmarkerResult]]):
     @property
     def result(self) -> Optional[PoseLandmarkerResult]:
         return self._result
+
+    def close(self) -> None:
+        self._detector.close()
+
+class DetectorPool:
+    '''
+    Landmarkers that can be enabled or disabled at runtime.
+
+    A landmarker is created when it is enabled
+    and closed as soon as it is disabled, so disabled landmarkers
+    hold no models or threads.
+    '''
+
+    def __init__(
+        self,
+        factories: Mapping[str, Callable[[], Detector[Any]]],
+        enabled: Iterable[str] = ()
+    ) -> None:
+        self._factories = dict(factories)
+        self._detectors: dict[str, Detector[Any]] = {}
+        self._ever_loaded: set[str] = set()
+        for name in enabled:
+            self.enable(name)
+
+    @property
+    def names(self) -> list[str]:
+        '''All landmarker names, in factory order.'''
+        return list(self._factories)
+
+    @property
+    def active(self) -> list[Detector[Any]]:
+        '''The enabled landmarkers, in factory order.'''
+        return [
+            self._detectors[name]
+            for name in self._factories
+            if name in self._detectors
+        ]
+
+    def is_enabled(self, name: str) -> bool:
+        self.__check_name(name)
+        return name in self._detectors
+
+    def enable(self, name: str) -> None:
+        '''Creates the landmarker, if not already enabled.'''
+        if self.is_enabled(name):
+            return
+        self._detectors[name] = self._factories[name]()
+        self._ever_loaded.add(name)
+
+    def disable(self, name: str) -> None:
+        '''Closes the landmarker, if not already disabled.'''
+        if not self.is_enabled(name):
+            return
+        self._detectors.pop(name).close()
+
+    def toggle(self, name: str) -> bool:
+        '''Enables or disables the landmarker, returning its new state.'''
+        if self.is_enabled(name):
+            self.disable(name)
+            return False
+        self.enable(name)
+        return True
+
+    def close(self) -> None:
+        '''Disables every landmarker.'''
+        for name in self.names:
+            self.disable(name)
+
+    def status(self) -> str:
+        '''Reports which landmarkers are running, closed or never loaded.'''
+        states = []
+        for name in self._factories:
+            if name in self._detectors:
+                state = 'running'
+            elif name in self._ever_loaded:
+                state = 'closed'
+            else:
+                state = 'never loaded'
+            states.append(f'{name}: {state}')
+        return 'Detectors: ' + ', '.join(states)
+
+    def __check_name(self, name: str) -> None:
+        if name not in self._factories:
+            raise ValueError(
+                f'Unknown detector {name!r}, expected one of {self.names}'
+            )
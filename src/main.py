@@ -3,17 +3,24 @@
 
 """MediaPipe demo."""
 
+import argparse
 import os
+import queue
 import sys
+import threading
 import time
 
 import cv2
 import mediapipe as mp
 import numpy as np
 
-from .colab import cv2_imshow
-from .detectors import BodyDetector, FaceDetector, HandDetector
+from .colab import (DEFAULT_JPEG_QUALITY, DEFAULT_MAX_FPS,
+                    configure_colab_display, cv2_destroy_all_windows,
+                    cv2_imshow)
+from .detectors import (BodyDetector, DetectorPool, FaceDetector,
+                        HandDetector)
 from .drawing import draw_landmarks_on_image
+from .motion import MotionGate, result_regions
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_DIR = os.path.join(_SCRIPT_DIR, '..')
@@ -25,16 +32,94 @@ _CAMERA_INDEX = 0
 _REFRESH_RATE_MS = 1
 _EXIT_KEY = ord('q')
 _WINDOW_TITLE = 'Hand, face and body recognition'
+# Detectors in drawing order, each toggled by its initial
+_DETECTOR_FACTORIES = {
+    'body': lambda: BodyDetector(_BODY_MODEL_ASSET_PATH),
+    'face': lambda: FaceDetector(_FACE_MODEL_ASSET_PATH),
+    'hand': lambda: HandDetector(_HAND_MODEL_ASSET_PATH)
+}
+_TOGGLE_KEYS = {ord(name[0]): name for name in _DETECTOR_FACTORIES}
+_DETECTOR_COMMANDS = ('enable', 'disable', 'toggle')
+
+def _read_commands(commands: queue.Queue[str]) -> None:
+    '''Forwards lines typed on stdin to the main loop.'''
+    for line in sys.stdin:
+        commands.put(line)
+
+def _run_command(
+    detectors: DetectorPool,
+    motion_gate: MotionGate,
+    command: str
+) -> None:
+    '''Runs a command such as `enable face`, `toggle hand` or `status`.'''
+    words = command.split()
+    if words == ['status']:
+        print(detectors.status())
+        return
+    if len(words) != 2 or words[0] not in _DETECTOR_COMMANDS \
+            or words[1] not in _DETECTOR_FACTORIES:
+        print(f"Error: Unknown command {command.strip()!r}.", file=sys.stderr)
+        return
+    action, name = words
+    try:
+        getattr(detectors, action)(name)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error: Failed to {action} the {name} detector: {e}",
+              file=sys.stderr)
+    # A newly enabled detector has no results yet
+    motion_gate.reset()
+    print(detectors.status())
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--detectors',
+        nargs='*',
+        choices=list(_DETECTOR_FACTORIES),
+        default=list(_DETECTOR_FACTORIES),
+        help='detectors enabled at startup (default: all)'
+    )
+    parser.add_argument(
+        '--colab-max-fps',
+        type=float,
+        default=DEFAULT_MAX_FPS,
+        help='maximum frame rate shown in Colab (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--colab-jpeg-quality',
+        type=int,
+        default=DEFAULT_JPEG_QUALITY,
+        help='JPEG quality of frames shown in Colab, from 0 to 100'
+             ' (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--motion-regions',
+        action='store_true',
+        help='measure motion mainly within the last detected regions'
+    )
+    args = parser.parse_args()
+    try:
+        configure_colab_display(args.colab_max_fps, args.colab_jpeg_quality)
+    except ValueError as e:
+        parser.error(str(e))
     # Opening the default camera
     capture = cv2.VideoCapture(_CAMERA_INDEX)
-    # Configuring models
-    hand_detector = HandDetector(_HAND_MODEL_ASSET_PATH)
-    face_detector = FaceDetector(_FACE_MODEL_ASSET_PATH)
-    body_detector = BodyDetector(_BODY_MODEL_ASSET_PATH)
+    # Configuring models, loading only the enabled ones
+    detectors = DetectorPool(_DETECTOR_FACTORIES, args.detectors)
+    motion_gate = MotionGate()
     start_time_s = time.time()
     print(f'+=================+\n| Press {chr(_EXIT_KEY)} to quit |\n+=================+')
+    for key, name in _TOGGLE_KEYS.items():
+        print(f'Press {chr(key)} to toggle the {name} detector')
+    print(f"Or type {'/'.join(_DETECTOR_COMMANDS)} <detector>, or status")
+    print(detectors.status())
+    commands: queue.Queue[str] = queue.Queue()
+    threading.Thread(
+        target=_read_commands,
+        args=(commands,),
+        name='commands',
+        daemon=True
+    ).start()
     try:
         while True:
             # Capturing a frame from the camera
@@ -42,32 +127,45 @@ if __name__ == '__main__':
             if not success:
                 print("Error: Failed to capture frame.", file=sys.stderr)
                 break
-            # Processing image asynchronously
+            # Processing image asynchronously,
+            # reusing the latest results if nothing has moved
             img = mp.Image(mp.ImageFormat.SRGB, data=raw_img)
-            passed_time_ms = int(1000 * (time.time() - start_time_s))
-            body_detector.detect_async(img, passed_time_ms)
-            face_detector.detect_async(img, passed_time_ms)
-            hand_detector.detect_async(img, passed_time_ms)
+            regions = [
+                region
+                for detector in detectors.active
+                if detector.result is not None
+                for region in result_regions(detector.result)
+            ] if args.motion_regions else None
+            if motion_gate.should_detect(raw_img, regions):
+                passed_time_ms = int(1000 * (time.time() - start_time_s))
+                for detector in detectors.active:
+                    detector.detect_async(img, passed_time_ms)
             # Drawing latest results
             annotated_image = np.copy(img.numpy_view())
-            if body_detector.result is not None:
-                draw_landmarks_on_image(annotated_image, body_detector.result)
-            if face_detector.result is not None:
-                draw_landmarks_on_image(annotated_image, face_detector.result)
-            if hand_detector.result is not None:
-                draw_landmarks_on_image(annotated_image, hand_detector.result)
+            for detector in detectors.active:
+                if detector.result is not None:
+                    draw_landmarks_on_image(annotated_image, detector.result)
             # Rendering window
             cv2_imshow(_WINDOW_TITLE, annotated_image)
-            if cv2.waitKey(_REFRESH_RATE_MS) & 0xFF == _EXIT_KEY:
+            key = cv2.waitKey(_REFRESH_RATE_MS) & 0xFF
+            if key == _EXIT_KEY:
                 # Destroy window ASAP while we still have focus,
                 # otherwise later destruction might hang
                 cv2.destroyWindow(_WINDOW_TITLE)
                 break
+            if key in _TOGGLE_KEYS:
+                _run_command(detectors, motion_gate,
+                             f'toggle {_TOGGLE_KEYS[key]}')
+            # Detectors are only changed here, on the main thread
+            while not commands.empty():
+                _run_command(detectors, motion_gate, commands.get())
     except KeyboardInterrupt:
         # Exit cleanly if program is interrupted
         pass
     finally:
         # Releasing resources
         capture.release()
-        cv2.destroyAllWindows()
+        detectors.close()
+        print(motion_gate.stats())
+        cv2_destroy_all_windows()
         cv2.waitKey(1) # https://stackoverflow.com/a/13850341
@@ -0,0 +1,205 @@
+"""Motion gating to skip landmarking on static scenes."""
+
+from typing import Iterable, Optional, TypeAlias
+
+import cv2
+import numpy as np
+
+from .type_aliases import (FaceLandmarkerResult, HandLandmarkerResult,
+                           LandmarkerResult, PoseLandmarkerResult)
+
+Region: TypeAlias = tuple[float, float, float, float]
+'''A normalized `(x_min, y_min, x_max, y_max)` bounding box.'''
+
+_DEFAULT_WIDTH = 64 # pixels
+_DEFAULT_MIN_THRESHOLD = 2.0 # mean absolute grayscale difference
+_DEFAULT_MAX_THRESHOLD = 8.0 # mean absolute grayscale difference
+_DEFAULT_SENSITIVITY = 3.0 # noise deviations above the noise floor
+_DEFAULT_NOISE_DECAY = 0.05
+_DEFAULT_MAX_STALE_FRAMES = 30
+_DEFAULT_REGION_MARGIN = 0.1 # fraction of the frame
+_DEFAULT_FULL_FRAME_SLACK = 2.0 # threshold multiplier outside regions
+
+def result_regions(detection_result: LandmarkerResult) -> list[Region]:
+    '''Returns the bounding box of each detected hand, face or body.'''
+    if isinstance(detection_result, HandLandmarkerResult):
+        landmarks_list = detection_result.hand_landmarks
+    elif isinstance(detection_result, FaceLandmarkerResult):
+        landmarks_list = detection_result.face_landmarks
+    elif isinstance(detection_result, PoseLandmarkerResult):
+        landmarks_list = detection_result.pose_landmarks
+    else:
+        raise NotImplementedError(
+            'Can only find regions of hand, face or body landmarks'
+        )
+    regions: list[Region] = []
+    for landmarks in landmarks_list:
+        if not landmarks:
+            continue
+        x_coordinates = [landmark.x for landmark in landmarks]
+        y_coordinates = [landmark.y for landmark in landmarks]
+        regions.append((
+            min(x_coordinates), min(y_coordinates),
+            max(x_coordinates), max(y_coordinates)
+        ))
+    return regions
+
+class MotionGate:
+    '''
+    Decides whether a frame differs enough from the last detected frame
+    to be worth landmarking again.
+
+    Frames are compared on a heavily downsampled grayscale copy.
+    The threshold adapts to the camera's noise floor, measured
+    between consecutive frames, and is bounded
+    by `min_threshold` and `max_threshold`. Detection is forced once
+    `max_stale_frames` consecutive frames have been skipped.
+    '''
+
+    def __init__(
+        self,
+        width: int = _DEFAULT_WIDTH,
+        min_threshold: float = _DEFAULT_MIN_THRESHOLD,
+        max_threshold: float = _DEFAULT_MAX_THRESHOLD,
+        sensitivity: float = _DEFAULT_SENSITIVITY,
+        noise_decay: float = _DEFAULT_NOISE_DECAY,
+        max_stale_frames: int = _DEFAULT_MAX_STALE_FRAMES,
+        region_margin: float = _DEFAULT_REGION_MARGIN,
+        full_frame_slack: float = _DEFAULT_FULL_FRAME_SLACK
+    ) -> None:
+        if width <= 0:
+            raise ValueError('width must be positive')
+        if max_threshold < min_threshold:
+            raise ValueError('max_threshold must not be below min_threshold')
+        if not 0 < noise_decay <= 1:
+            raise ValueError('noise_decay must be in (0, 1]')
+        if max_stale_frames < 0:
+            raise ValueError('max_stale_frames must not be negative')
+        self._width = width
+        self._min_threshold = min_threshold
+        self._max_threshold = max_threshold
+        self._sensitivity = sensitivity
+        self._noise_decay = noise_decay
+        self._max_stale_frames = max_stale_frames
+        self._region_margin = region_margin
+        self._full_frame_slack = full_frame_slack
+        self._reference: Optional[np.ndarray] = None
+        self._previous: Optional[np.ndarray] = None
+        self._noise_mean = 0.0
+        self._noise_var = 0.0
+        self._stale_frames = 0
+        self.frames = 0
+        self.skipped_frames = 0
+        self.forced_frames = 0
+
+    @property
+    def threshold(self) -> float:
+        '''The current motion threshold.'''
+        noise_dev = self._noise_var ** 0.5
+        threshold = self._noise_mean + self._sensitivity * noise_dev
+        return min(self._max_threshold, max(self._min_threshold, threshold))
+
+    @property
+    def saved_ratio(self) -> float:
+        '''The fraction of frames for which detection was skipped.'''
+        return self.skipped_frames / self.frames if self.frames else 0.0
+
+    def should_detect(
+        self,
+        frame: np.ndarray,
+        regions: Optional[Iterable[Region]] = None
+    ) -> bool:
+        '''
+        Returns whether `frame` should be landmarked.
+
+        If `regions` is given and not empty, motion is measured
+        within those regions, e.g. the last known hands, faces and bodies.
+        The rest of the frame is still checked, against a threshold
+        `full_frame_slack` times higher, so new objects are noticed.
+        '''
+        self.frames += 1
+        small = self.__downsample(frame)
+        self.__update_noise(small)
+        if self._reference is None or self._reference.shape != small.shape:
+            return self.__detect(small)
+        if self._stale_frames >= self._max_stale_frames:
+            self.forced_frames += 1
+            return self.__detect(small)
+        if self.__moved(small, regions):
+            return self.__detect(small)
+        self._stale_frames += 1
+        self.skipped_frames += 1
+        return False
+
+    def reset(self) -> None:
+        '''Forces detection on the next frame.'''
+        self._reference = None
+
+    def stats(self) -> str:
+        '''Summarizes how much inference was saved.'''
+        return (
+            f'Motion gate: skipped {self.skipped_frames}/{self.frames} frames'
+            f' ({100 * self.saved_ratio:.1f}%),'
+            f' forced {self.forced_frames} stale re-detections'
+        )
+
+    def __downsample(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        size = (self._width, max(1, round(height * self._width / width)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def __moved(
+        self,
+        small: np.ndarray,
+        regions: Optional[Iterable[Region]]
+    ) -> bool:
+        diff = cv2.absdiff(small, self._reference)
+        threshold = self.threshold
+        mask = self.__region_mask(small.shape, regions)
+        if mask is None:
+            return float(np.mean(diff)) > threshold
+        if cv2.mean(diff, mask=mask)[0] > threshold:
+            return True
+        return float(np.mean(diff)) > self._full_frame_slack * threshold
+
+    def __region_mask(
+        self,
+        shape: tuple[int, ...],
+        regions: Optional[Iterable[Region]]
+    ) -> Optional[np.ndarray]:
+        if regions is None:
+            return None
+        height, width = shape[:2]
+        mask = np.zeros((height, width), dtype=np.uint8)
+        margin = self._region_margin
+        for x_min, y_min, x_max, y_max in regions:
+            left = max(0, int((x_min - margin) * width))
+            top = max(0, int((y_min - margin) * height))
+            right = min(width, int(np.ceil((x_max + margin) * width)))
+            bottom = min(height, int(np.ceil((y_max + margin) * height)))
+            if right <= left or bottom <= top:
+                continue
+            mask[top:bottom, left:right] = 255
+        # Regions entirely off-screen leave nothing to compare
+        return mask if mask.any() else None
+
+    def __update_noise(self, small: np.ndarray) -> None:
+        previous, self._previous = self._previous, small
+        if previous is None or previous.shape != small.shape:
+            return
+        score = float(np.mean(cv2.absdiff(small, previous)))
+        # Changes above the highest possible threshold are motion, not noise.
+        if score > self._max_threshold:
+            return
+        delta = score - self._noise_mean
+        self._noise_mean += self._noise_decay * delta
+        self._noise_var = (1 - self._noise_decay) \
+            * (self._noise_var + self._noise_decay * delta * delta)
+
+    def __detect(self, small: np.ndarray) -> bool:
+        self._reference = small
+        self._stale_frames = 0
+        return True
@@ -0,0 +1,35 @@
+"""Motion gating tests."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('cv2')
+pytest.importorskip('mediapipe')
+
+from src.motion import MotionGate
+
+_WIDTH = 64
+_HEIGHT = 48
+
+def _noisy_frames(count: int, noise_std: float) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(count):
+        noise = rng.normal(0, noise_std, (_HEIGHT, _WIDTH, 3))
+        frames.append(np.clip(128 + noise, 0, 255).astype(np.uint8))
+    return frames
+
+def test_threshold_adapts_to_constant_noise() -> None:
+    gate = MotionGate(width=_WIDTH, min_threshold=2.0)
+    for frame in _noisy_frames(300, noise_std=8.0):
+        gate.should_detect(frame)
+    assert gate.threshold > 2.0
+    assert gate.skipped_frames > 0
+
+def test_off_screen_regions_are_ignored() -> None:
+    gate = MotionGate(width=_WIDTH)
+    mask = gate._MotionGate__region_mask(
+        (_HEIGHT, _WIDTH),
+        [(-0.5, 0.2, -0.2, 0.5), (0.2, 1.3, 0.5, 1.6)]
+    )
+    assert mask is None